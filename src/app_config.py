@@ -7,11 +7,10 @@ import os
 import subprocess
 import sys
 
-import yaml
-
 from constants import SCRIPT_DIR, get_tests_folder, get_app_folder
 from tester_config import TesterConfig
 from utils.base import Loggable
+from utils.yaml_fast import safe_load
 
 
 class AppConfig(Loggable):
@@ -147,7 +146,7 @@ class AppConfig(Loggable):
         run_config_path = os.path.join("test-app-config/catalog" + relative_path, run_config_file)
         
         with open(run_config_path, "r", encoding="utf-8") as stream:
-            data = yaml.safe_load(stream)
+            data = safe_load(stream)
 
         self.config["networking"] = False
 
@@ -181,7 +180,7 @@ class AppConfig(Loggable):
         """
 
         with open(app_config_file, "r", encoding="utf-8") as stream:
-            data = yaml.safe_load(stream)
+            data = safe_load(stream)
 
         self.einitrd = False
         self.config["unikraft"] = None
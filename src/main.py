@@ -14,7 +14,7 @@ from build_setup import BuildSetup
 from run_setup import RunSetup
 from system_config import SystemConfig
 from target_setup import TargetSetup
-from test_runner import TestRunner
+from test_runner import TestRunner, run_all_tests
 from tester_config import TesterConfig
 from utils.cleanup import cleanup_folder
 from utils.create_runtime_kernel import create_examples_runtime
@@ -191,6 +191,16 @@ def parse_arguments():
         action="store_true",
         help="Only generate target configurations and exit without running tests",
     )
+    parser.add_argument(
+        "--build-jobs",
+        "-j",
+        dest="build_jobs",
+        type=int,
+        help=(
+            "Maximum number of builds to run concurrently "
+            "(default: build and run one target at a time)"
+        ),
+    )
     parser.add_argument(
         "--verbose", "-v", action="store_true", help="Enable verbose output (debug level logs)"
     )
@@ -307,7 +317,9 @@ def main():
         if a.is_example():
             logger.info("Generating key target runtimes for example application.")
             runtime_name = a.config['runtime'].split(":")[0]
-            create_examples_runtime(selected_targets, targets, runtime_name)
+            create_examples_runtime(
+                selected_targets, targets, runtime_name, max_workers=args.build_jobs
+            )
 
 
         # Exit early if generate-only flag is set
@@ -339,17 +351,20 @@ def main():
         
 
         # Run tests for selected or all targets
-        tests_run = 0
+        runners = []
         for test_no, target_config in enumerate(targets):
             # Skip if specific targets selected and this isn't one of them
             if selected_targets is not None and test_no not in selected_targets:
                 logger.debug(f"Skipping target {test_no + 1}")
                 continue
                 
-            logger.info(f"Running target {test_no + 1} of {len(targets)}")
-            runner = TestRunner(target_config, app_dir, session)
-            runner.run_test()
-            tests_run += 1
+            logger.info(f"Queueing target {test_no + 1} of {len(targets)}")
+            runners.append(
+                TestRunner(target_config, app_dir, session, split_build_logs=args.verbose)
+            )
+
+        run_all_tests(runners, max_workers=args.build_jobs)
+        tests_run = len(runners)
             
         logger.info(f"Completed {tests_run} test(s) successfully.")
 
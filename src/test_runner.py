@@ -2,35 +2,252 @@
 This module provides TestRunner class to manage the test execution.
 """
 
+import contextlib
 import csv
+import functools
+import http.client
+import mmap
 import os
+import re
+import shutil
+import signal
+import socket
 import subprocess
+import threading
 import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, wait
 from subprocess import PIPE, Popen, run
 import shlex  # Add this import for safely splitting shell commands
-
-import yaml
+from typing import Optional
 
 from target_setup import TargetSetup
 from utils.base import Loggable
 from utils.process_utils import terminate_buildkitd
 from utils.setup_session import SessionSetup
+from utils.yaml_fast import safe_load
 from constants import get_tests_folder
 
+# Run logs smaller than this are read directly, mapping them costs more than it saves
+MMAP_MIN_SIZE = 4096
+# Address of the unikernel on bridge and tap networks, see the run script templates
+GUEST_IP = "172.44.0.2"
+# Seconds a run script and its VMM are given to exit after SIGTERM before they are killed
+RUN_STOP_TIMEOUT = 5
+# Exit codes curl uses for the failures reproduced by _fetch_url
+CURL_COULDNT_CONNECT = 7
+CURL_RECV_ERROR = 56
+# Serializes appends to the shared build and run reports
+_REPORT_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _load_test_app_configs(test_app_dir: str) -> tuple[dict, dict]:
+    """
+    Load the build and run configurations of a test application.
+
+    The configurations are the same for every target of the application, so they
+    are parsed once and shared by all TestRunner instances.
+
+    Args:
+        test_app_dir (str): Directory holding BuildConfig.yaml and RunConfig.yaml.
+
+    Returns:
+        tuple[dict, dict]: The build and the run configuration.
+    """
+    with open(os.path.join(test_app_dir, "BuildConfig.yaml"), "r") as f:
+        test_build_config = safe_load(f)
+
+    with open(os.path.join(test_app_dir, "RunConfig.yaml"), "r") as f:
+        test_run_config = safe_load(f)
+
+    return test_build_config, test_run_config
+
+
+@functools.lru_cache(maxsize=8)
+def _compile_output_pattern(
+    possible_outputs: tuple[str, ...], binary: bool = False
+) -> Optional[re.Pattern]:
+    """
+    Build a single case-insensitive matcher for the expected outputs.
+
+    A run log is accepted when it contains any word of any expected output, so all
+    the words are folded into one alternation and the log is scanned once. An
+    output without words, such as an empty one, is kept whole, so an empty
+    expected output matches every log as it always did.
+
+    Args:
+        possible_outputs (tuple[str, ...]): The expected outputs.
+        binary (bool): Build a bytes matcher, to search raw or memory-mapped logs.
+
+    Returns:
+        Optional[re.Pattern]: The compiled matcher, None if there is nothing to match.
+    """
+    words = dict.fromkeys(
+        word for output in possible_outputs for word in (output.split() or (output,))
+    )
+    if not words:
+        return None
+
+    if binary:
+        return re.compile(b"|".join(re.escape(word.encode()) for word in words), re.IGNORECASE)
+
+    return re.compile("|".join(map(re.escape, words)), re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=32)
+def _split_command(command: str) -> tuple[str, ...]:
+    """
+    Split a test command into its arguments, honouring shell quoting.
+
+    Args:
+        command: The test command, after the guest address substitution
+
+    Returns:
+        tuple[str, ...]: The command arguments
+    """
+    return tuple(shlex.split(command))
+
+
+def _plain_curl_url(command: tuple[str, ...]) -> Optional[str]:
+    """
+    Extract the URL of a curl command that does nothing but a plain GET.
+
+    Args:
+        command: The split test command
+
+    Returns:
+        Optional[str]: The URL, or None if the command needs the curl binary
+    """
+    if len(command) == 2 and command[0] == "curl" and re.fullmatch(r"https?://\S+", command[1]):
+        return command[1]
+    return None
+
+
+def _fetch_url(url: str, timeout: float) -> tuple[int, str, str]:
+    """
+    Fetch a URL the way a plain curl invocation would.
+
+    Like curl without --fail, an HTTP error status still counts as a successful
+    transfer and its body is returned. Like curl without -L, redirects are not
+    followed, the body of the redirect response is returned.
+
+    Args:
+        url: The URL to fetch
+        timeout: Timeout in seconds for the whole transfer
+
+    Returns:
+        tuple[int, str, str]: The curl exit code, the response body and an error message
+
+    Raises:
+        subprocess.TimeoutExpired: If the transfer takes longer than timeout, as
+        running curl with the same timeout would
+    """
+    deadline = time.monotonic() + timeout
+
+    def remaining() -> float:
+        left = deadline - time.monotonic()
+        if left <= 0:
+            raise subprocess.TimeoutExpired(["curl", url], timeout)
+        return left
+
+    try:
+        parts = urllib.parse.urlsplit(url)
+        connection_class = (
+            http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        )
+        connection = connection_class(parts.hostname, parts.port, timeout=remaining())
+        connection.connect()
+        # Kept apart, the connection drops its socket once the response says it closes
+        sock = connection.sock
+    except (socket.timeout, TimeoutError):
+        raise subprocess.TimeoutExpired(["curl", url], timeout)
+    except (OSError, ValueError, http.client.HTTPException) as e:
+        return CURL_COULDNT_CONNECT, "", f"curl: ({CURL_COULDNT_CONNECT}) {e}\n"
+
+    # Every socket operation only gets the time left, so the timeout bounds the whole
+    # transfer as curl --max-time does, not each read
+    try:
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        sock.settimeout(remaining())
+        connection.request("GET", path, headers={"Accept": "*/*"})
+        sock.settimeout(remaining())
+        response = connection.getresponse()
+        chunks = []
+        while True:
+            sock.settimeout(remaining())
+            chunk = response.read1(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    except (socket.timeout, TimeoutError):
+        raise subprocess.TimeoutExpired(["curl", url], timeout)
+    except (http.client.HTTPException, OSError) as e:
+        return CURL_RECV_ERROR, "", f"curl: ({CURL_RECV_ERROR}) {e}\n"
+    finally:
+        connection.close()
+
+    return 0, b"".join(chunks).decode("utf-8", errors="replace"), ""
+
+
+def _process_group_alive(pgid: int) -> bool:
+    """
+    Check whether any process of a process group is still running.
+
+    Args:
+        pgid: The process group id
+
+    Returns:
+        bool: True if the group still has a member, including one that runs as
+        another user and can not be signalled
+    """
+    try:
+        os.killpg(pgid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _signal_process_group(pgid: int, sig: int) -> None:
+    """
+    Send a signal to a process group, ignoring a group that is already gone.
+
+    Args:
+        pgid: The process group id
+        sig: The signal to send
+    """
+    try:
+        os.killpg(pgid, sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
 
 class TestRunner(Loggable):
     """
     This TestRunner class is designed to manage the test execution.
     """
 
-    def __init__(self, target: TargetSetup, o_app_dir: str, session: SessionSetup) -> None:
+    def __init__(
+        self,
+        target: TargetSetup,
+        o_app_dir: str,
+        session: SessionSetup,
+        split_build_logs: bool = False,
+    ) -> None:
         """
         Initialize the TestRunner with a specific target configrations.
 
         :param targets: Specific TargetSetup object for TestRunner.
+        :param split_build_logs: Keep the build stdout and stderr in separate log files
+            instead of a single build.log.
         """
         super().__init__()
         self.target = target
+        self.split_build_logs = split_build_logs
         self.test_app_dir = os.path.join(
             os.getcwd(), "test-app-config", "catalog" + o_app_dir.split("/catalog")[-1]
         )
@@ -38,15 +255,7 @@ class TestRunner(Loggable):
         if not os.path.exists(self.test_app_dir):
             raise FileNotFoundError(f"Test app directory does not exist: {self.test_app_dir}")
 
-        """
-        TODO: I/O operations makes it slow, so I will load 
-        the build and run configurations only once. 
-        """
-        with open(os.path.join(self.test_app_dir, "BuildConfig.yaml"), "r") as f:
-            self.test_build_config = yaml.safe_load(f)
-
-        with open(os.path.join(self.test_app_dir, "RunConfig.yaml"), "r") as f:
-            self.test_run_config = yaml.safe_load(f)
+        self.test_build_config, self.test_run_config = _load_test_app_configs(self.test_app_dir)
 
         self.session_dir = session.session_dir
         self.session_reports_dir = session.session_reports_dir
@@ -74,19 +283,26 @@ class TestRunner(Loggable):
 
         self.logger.info(f"Building target: {self.target.id}")
 
+        # Both streams go to build.log unless they are asked to be kept apart
+        if self.split_build_logs:
+            stdout_log, stderr_log = "build_stdout.log", "build_stderr.log"
+        else:
+            stdout_log = stderr_log = "build.log"
+
         # Initialize log files with headers
-        self._write_log_file(
-            self.target.build_config.dir,
-            "build_stdout.log",
-            f"=== BUILD STARTED for {self.target.id} ===\n",
-            mode="w",
-        )
-        self._write_log_file(
+        stdout_path = self._write_log_file(
             self.target.build_config.dir,
-            "build_stderr.log",
+            stdout_log,
             f"=== BUILD STARTED for {self.target.id} ===\n",
             mode="w",
         )
+        if self.split_build_logs:
+            stderr_path = self._write_log_file(
+                self.target.build_config.dir,
+                stderr_log,
+                f"=== BUILD STARTED for {self.target.id} ===\n",
+                mode="w",
+            )
 
         threshold_timeout = self.test_build_config.get("th_time", 300)
 
@@ -95,21 +311,33 @@ class TestRunner(Loggable):
             self._terminate_buildkitd()
 
         try:
-            # Use subprocess.run with timeout for better control
-            result = subprocess.run(
-                ["bash", build_script_path],
-                cwd=self.target.build_config.dir,
-                capture_output=True,
-                text=True,
-                timeout=threshold_timeout,
-                check=False,  # Don't raise exception on non-zero exit codes
-            )
+            # The build output goes straight to the log files, after their headers
+            with open(stdout_path, "ab") as stdout, (
+                open(stderr_path, "ab")
+                if self.split_build_logs
+                else contextlib.nullcontext(subprocess.STDOUT)
+            ) as stderr:
+                # Use subprocess.run with timeout for better control
+                result = subprocess.run(
+                    ["bash", build_script_path],
+                    cwd=self.target.build_config.dir,
+                    stdout=stdout,
+                    stderr=stderr,
+                    timeout=threshold_timeout,
+                    check=False,  # Don't raise exception on non-zero exit codes
+                )
+
+            if result.returncode != 0:
+                self.logger.info(
+                    f"[!] Build completed with non-zero exit code: {result.returncode}"
+                )
+                build_status = f"\n=== BUILD FAILED with exit code {result.returncode} ===\n"
+            else:
+                self.logger.info(f"[✓] Build completed successfully")
+                build_status = f"\n=== BUILD COMPLETED SUCCESSFULLY ===\n"
 
             self._write_log_file(
-                self.target.build_config.dir, "build_stdout.log", result.stdout, mode="a+"
-            )
-            self._write_log_file(
-                self.target.build_config.dir, "build_stderr.log", result.stderr, mode="a+"
+                self.target.build_config.dir, stdout_log, build_status, mode="a+"
             )
             self._write_log_file(
                 self.target.build_config.dir,
@@ -118,25 +346,6 @@ class TestRunner(Loggable):
                 mode="w",
             )
 
-            if result.returncode != 0:
-                self.logger.info(
-                    f"[!] Build completed with non-zero exit code: {result.returncode}"
-                )
-                self._write_log_file(
-                    self.target.build_config.dir,
-                    "build_stdout.log",
-                    f"\n=== BUILD FAILED with exit code {result.returncode} ===\n",
-                    mode="a+",
-                )
-            else:
-                self.logger.info(f"[✓] Build completed successfully")
-                self._write_log_file(
-                    self.target.build_config.dir,
-                    "build_stdout.log",
-                    f"\n=== BUILD COMPLETED SUCCESSFULLY ===\n",
-                    mode="a+",
-                )
-
         except subprocess.TimeoutExpired:
             self.logger.info(f"[✗] Build timed out after {threshold_timeout} seconds")
             # Append timeout information to existing logs
@@ -144,7 +353,7 @@ class TestRunner(Loggable):
                 f"\n=== BUILD TIMEOUT - Process killed after {threshold_timeout} seconds ===\n"
             )
             self._write_log_file(
-                self.target.build_config.dir, "build_stderr.log", timeout_msg, mode="a+"
+                self.target.build_config.dir, stderr_log, timeout_msg, mode="a+"
             )
             self._write_log_file(
                 self.target.build_config.dir, "build_returncode.log", "-1", mode="w"
@@ -154,7 +363,7 @@ class TestRunner(Loggable):
             # Append error information to existing logs
             error_msg = f"\n=== BUILD ERROR: {str(e)} ===\n"
             self._write_log_file(
-                self.target.build_config.dir, "build_stderr.log", error_msg, mode="a+"
+                self.target.build_config.dir, stderr_log, error_msg, mode="a+"
             )
             self._write_log_file(
                 self.target.build_config.dir, "build_returncode.log", "-2", mode="w"
@@ -176,29 +385,97 @@ class TestRunner(Loggable):
         """
         run_script_path = os.path.join(run_target_dir, "run")
 
-        tests_index = run_target_dir.find(get_tests_folder())
-        if tests_index == -1:
-            self.logger.error(f"Directory does not contain '{get_tests_folder()}' segment, cannot write log file.")
-            raise ValueError(f"Directory does not contain '{get_tests_folder()}' segment")
-        test_dir_structure = run_target_dir[tests_index + 1 :]
-
-        # Creating a new path for the sessions
-        # cwd + catalog_structure + session_name + test_dir_structure
-        self.run_log_dir = os.path.join(self.session_dir, test_dir_structure)
-        os.makedirs(self.run_log_dir, exist_ok=True)
-        self.run_log_path = os.path.join(self.run_log_dir, "run.log")
+        run_log_dir = self._get_session_log_dir(run_target_dir)
+        os.makedirs(run_log_dir, exist_ok=True)
 
-        # Start run script in background
-        with open(self.run_log_path, "w") as run_log_file:
+        # Start run script in background, in its own process group so that it can be
+        # stopped together with the VMM it starts, see _stop_unikernel
+        with open(os.path.join(run_log_dir, "run.log"), "w") as run_log_file:
             process = subprocess.Popen(
                 ["bash", run_script_path],
                 cwd=run_target_dir,
                 stdout=run_log_file,
                 stderr=run_log_file,
+                start_new_session=True,
             )
 
         return process
 
+    def _wait_for_unikernel(self, process: Popen, run_config) -> None:
+        """
+        Wait for the unikernel to be ready, at most UnikernelBootupTime seconds.
+
+        Applications without networking are done once they exit. Applications on a
+        bridge or tap network are ready once their port accepts connections. With
+        NAT the forwarded host port accepts connections before the guest listens,
+        so the full boot up time is waited.
+
+        Args:
+            process (Popen): The running run script.
+            run_config (RunSetup): The run configuration being tested.
+        """
+        bootup_time = self.test_run_config.get("UnikernelBootupTime", 10)
+        network_type = run_config.config.get("networking", "none")
+
+        if network_type == "none":
+            try:
+                process.wait(timeout=bootup_time)
+                self.logger.info(f"[✓] Target {self.target.id} exited before the boot up timeout")
+            except subprocess.TimeoutExpired:
+                pass
+            return
+
+        port = self.test_run_config.get("RunMetadata", {}).get("ExposedPort")
+        if network_type not in ("bridge", "tap") or not port:
+            time.sleep(bootup_time)
+            return
+
+        # The previous VMM was waited for by _stop_unikernel, so whatever answers on
+        # the guest address is this run's unikernel
+        deadline = time.monotonic() + bootup_time
+        delay = 0.05
+        while time.monotonic() < deadline and process.poll() is None:
+            try:
+                with socket.create_connection((GUEST_IP, port), timeout=delay):
+                    self.logger.info(f"[✓] Target {self.target.id} is accepting connections")
+                    return
+            except OSError:
+                time.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+                delay = min(delay * 2, 1)
+
+    def _stop_unikernel(self, process: Popen) -> None:
+        """
+        Stop the run script and the VMM it started, and wait for them to exit.
+
+        The whole process group of the script is signalled. The VMM runs under sudo,
+        which relays the signal to it. Waiting for the script makes sure its run log
+        is complete before it is validated and leaves no zombie behind. Waiting for
+        the group makes sure the next run does not find this VMM on the guest
+        address, which every run configuration shares.
+
+        Args:
+            process (Popen): The running run script.
+        """
+        _signal_process_group(process.pid, signal.SIGTERM)
+        deadline = time.monotonic() + RUN_STOP_TIMEOUT
+        try:
+            process.wait(timeout=RUN_STOP_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            _signal_process_group(process.pid, signal.SIGKILL)
+            process.wait()
+
+        while _process_group_alive(process.pid):
+            if time.monotonic() >= deadline:
+                # Processes running as root can not be killed from here, the next
+                # run script stops them before starting its own VMM
+                _signal_process_group(process.pid, signal.SIGKILL)
+                self.logger.warning(
+                    f"[!] Processes of target {self.target.id} still running after "
+                    f"{RUN_STOP_TIMEOUT} seconds"
+                )
+                break
+            time.sleep(0.05)
+
     def _test_target_build(self, kernel_path: str) -> bool:
         """
         Returns True is the kernel is built successfully. By checking the kernel path.
@@ -210,7 +487,7 @@ class TestRunner(Loggable):
             bool: True if the kernel is built successfully, False otherwise.
         """
 
-        return True if os.path.exists(kernel_path) else False
+        return os.path.exists(kernel_path)
 
     def _update_test_command(self, test_command: str, network_type: str) -> str:
         """
@@ -226,7 +503,7 @@ class TestRunner(Loggable):
         if network_type == "bridge" or network_type == "tap":
             test_command = test_command.replace("https://", "")
             test_command = test_command.replace("http://", "")
-            test_command = test_command.replace("localhost", "172.44.0.2")
+            test_command = test_command.replace("localhost", GUEST_IP)
         
         return test_command
 
@@ -246,25 +523,30 @@ class TestRunner(Loggable):
         self.logger.info(f"Executing test command: {test_command}")
 
         try:
-            result = subprocess.run(
-                list(test_command.split()),
-                capture_output=True,
-                text=True,
-                timeout=4,  # Timeout for the curl command
-            )
-            run_log = result.stdout + result.stderr
-            output = result.stdout.replace("\r", "").replace("\t", "").strip()
+            command = _split_command(test_command)
+            url = _plain_curl_url(command)
+            if url is not None:
+                # A bare GET needs no curl process, fetch it from here
+                return_code, stdout, stderr = _fetch_url(url, timeout=4)
+            else:
+                result = subprocess.run(
+                    list(command),
+                    capture_output=True,
+                    text=True,
+                    timeout=4,  # Timeout for the curl command
+                )
+                return_code, stdout, stderr = result.returncode, result.stdout, result.stderr
+            run_log = stdout + stderr
+            output = stdout.replace("\r", "").replace("\t", "").strip()
             # self.logger.info(f"Curl command output: {output}")
-            # self.logger.info(f"Curl command error: {result.stderr}")
+            # self.logger.info(f"Curl command error: {stderr}")
 
-            if result.returncode == 0:
+            if return_code == 0:
                 self.logger.info("[✓] Curl test passed")
                 run_log += "\n[✓] Curl command  executed\n"
             else:
                 self.logger.info("[✗] Curl test failed")
                 run_log += "\n[✗] Curl command failed\n"
-
-            return_code = result.returncode
         except Exception as e:
             self.logger.info(f"[✗] Curl test encountered an error: {e}")
             run_log = f"[✗] Curl command failed with error: {e}\n"
@@ -310,17 +592,26 @@ class TestRunner(Loggable):
 
         return return_code, run_log
 
-    def _test_no_commands_run(self) -> tuple[int, str]:
+    def _test_no_commands_run(self, run_config) -> tuple[int, bool]:
         """
         Test the no commands run for the target setup.
+
+        The console output of the unikernel is the whole run log, so it is validated
+        in place and copied as the complete run log without being loaded in memory.
+
+        Returns:
+            tuple[int, bool]: The return code and whether the expected output was found.
         """
         self.logger.info(f"Testing no commands run for target: {self.target.id}")
 
+        run_log_dir = self._get_session_log_dir(run_config.dir)
+        run_log_path = os.path.join(run_log_dir, "run.log")
+
         # No commands to run, just return success
-        with open(self.run_log_path, "r") as run_log_file:
-            run_log = run_log_file.read()
+        output_matched = self._validate_run_log_file(run_log_path)
+        shutil.copyfile(run_log_path, os.path.join(run_log_dir, "complete_run.log"))
 
-        return 0, run_log
+        return 0, output_matched
 
     def _validate_run(self, run_log: str) -> bool:
         """
@@ -328,24 +619,64 @@ class TestRunner(Loggable):
 
         This method will check the run log for specific keywords to determine if the run was successful.
         """
-        possible_outputs = self.test_run_config.get(
-            "ListOfCommands", ["Hwllo, World!", "Bye world"]
+        output_pattern = self._get_output_pattern()
+        if output_pattern is None:
+            return False
+
+        match = output_pattern.search(run_log)
+        if match is None:
+            return False
+
+        self.logger.info(f"[✓] Found expected output: {match.group(0)}")
+        return True
+
+    def _validate_run_log_file(self, log_path: str) -> bool:
+        """
+        Validate a run log file without reading it into a string.
+
+        Logs past a few pages are memory-mapped and searched in place.
+
+        Args:
+            log_path (str): Path to the run log file.
+
+        Returns:
+            bool: True if the expected output was found, False otherwise.
+        """
+        output_pattern = self._get_output_pattern(binary=True)
+        if output_pattern is None:
+            return False
+
+        with open(log_path, "rb") as log_file:
+            if os.fstat(log_file.fileno()).st_size < MMAP_MIN_SIZE:
+                match = output_pattern.search(log_file.read())
+                found = match.group(0) if match else None
+            else:
+                with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as log_map:
+                    match = output_pattern.search(log_map)
+                    found = match.group(0) if match else None
+
+        if found is None:
+            return False
+
+        self.logger.info(
+            f"[✓] Found expected output: {found.decode('utf-8', errors='replace')}"
         )
-        string_found = False
+        return True
 
-        for output in possible_outputs:
-            for word in output.split():
-                if word.lower() in run_log.lower():
-                    string_found = True
-                    self.logger.info(f"[✓] Found expected output: {output}")
-                    break
+    def _get_output_pattern(self, binary: bool = False) -> Optional[re.Pattern]:
+        """
+        Get the matcher for the expected outputs of the test application.
 
-            if output.lower() in run_log.lower():
-                string_found = True
-                self.logger.info(f"[✓] Found expected output: {output}")
-                break
+        Args:
+            binary (bool): Whether the matcher is for bytes instead of str.
 
-        return string_found
+        Returns:
+            Optional[re.Pattern]: The compiled matcher, None if there is nothing to match.
+        """
+        possible_outputs = self.test_run_config.get(
+            "ListOfCommands", ["Hwllo, World!", "Bye world"]
+        )
+        return _compile_output_pattern(tuple(possible_outputs), binary)
 
     def _write_row_to_csv(self, row_dict: dict, csv_path: str) -> None:
         """
@@ -354,15 +685,16 @@ class TestRunner(Loggable):
         :param row_dict: Dictionary where keys are column names and values are row values
         :param csv_path: Path to the CSV file
         """
-        file_exists = os.path.isfile(csv_path)
+        # Builds of several targets may report at the same time, see run_all_tests
+        with _REPORT_LOCK:
+            with open(csv_path, mode="a", newline="") as file:
+                writer = csv.DictWriter(file, fieldnames=row_dict.keys())
 
-        with open(csv_path, mode="a", newline="") as file:
-            writer = csv.DictWriter(file, fieldnames=row_dict.keys())
+                # An append stream starts at the end, so an empty file is a new one
+                if file.tell() == 0:
+                    writer.writeheader()  # Write headers only once
 
-            if not file_exists:
-                writer.writeheader()  # Write headers only once
-
-            writer.writerow(row_dict)
+                writer.writerow(row_dict)
 
     def _update_build_report(self, target: TargetSetup, return_code: int, success: bool) -> None:
         """
@@ -421,6 +753,26 @@ class TestRunner(Loggable):
             f"[✓] Run report updated for target {run_config.dir.split('/')[-1]} with status {status}"
         )
 
+    def _get_session_log_dir(self, directory: str) -> str:
+        """
+        Map a directory of the tests folder to its log directory in the session.
+
+        Args:
+            directory (str): A target or run directory inside the tests folder.
+
+        Returns:
+            str: The matching directory inside the session directory.
+        """
+        tests_index = directory.find(get_tests_folder())
+        if tests_index == -1:
+            self.logger.error(f"Directory does not contain '{get_tests_folder()}' segment, cannot write log file.")
+            raise ValueError(f"Directory does not contain '{get_tests_folder()}' segment")
+        test_dir_structure = directory[tests_index + 1 :]
+
+        # Creating a new path for the sessions
+        # cwd + catalog_structure + session_name + test_dir_structure
+        return os.path.join(self.session_dir, test_dir_structure)
+
     def _write_log_file(self, directory: str, filename: str, data: str, mode: str = "w") -> str:
         """
         Writes the given data to a file in the specified directory.
@@ -436,21 +788,21 @@ class TestRunner(Loggable):
             str: The path to the log file if written successfully, otherwise an error message.
         """
         # TODO: Update this to the test app directory variable
-        tests_index = directory.find(get_tests_folder())
-        if tests_index == -1:
-            self.logger.error(f"Directory does not contain '{get_tests_folder()}' segment, cannot write log file.")
-            raise ValueError(f"Directory does not contain '{get_tests_folder()}' segment")
-        test_dir_structure = directory[tests_index + 1 :]
+        directory = self._get_session_log_dir(directory)
 
-        # Creating a new path for the sessions
-        # cwd + catalog_structure + session_name + test_dir_structure
-        directory = os.path.join(self.session_dir, test_dir_structure)
+        flags = os.O_WRONLY | os.O_CREAT | (os.O_APPEND if "a" in mode else os.O_TRUNC)
 
         try:
             os.makedirs(directory, exist_ok=True)  # Ensure the directory exists
             file_path = os.path.join(directory, filename)
-            with open(file_path, mode, encoding="utf-8") as f:
-                f.write(data)
+            # Write through the raw descriptor, the whole payload goes out in one write()
+            fd = os.open(file_path, flags, 0o644)
+            try:
+                payload = memoryview(data.encode("utf-8"))
+                while payload:
+                    payload = payload[os.write(fd, payload) :]
+            finally:
+                os.close(fd)
             self.logger.info(
                 f"[✓] Log {'appended to' if 'a' in mode else 'written to'} {file_path}"
             )
@@ -460,6 +812,68 @@ class TestRunner(Loggable):
             self.logger.error(f"[✗] {error_message}")
             raise Exception(error_message)
 
+    def _run_config_test(self, idx: int, run_config) -> None:
+        """
+        Run and validate a single run configuration of the target.
+
+        The run scripts stop every running VMM and kraft instance before starting
+        and the networked ones share fixed ports and the bridge address, so run
+        configurations are tested one at a time.
+
+        Args:
+            idx (int): Index of the run configuration in the target.
+            run_config (RunSetup): The run configuration to test.
+        """
+        self.logger.info(f"Running configuration: {run_config.dir}")
+        # self.logger.info(f"\tRun configuration of {idx + 1} is {run_config.config}")
+        running_process = self._run_target(run_config.dir)
+        self.logger.info(
+            f"[✓] Target {self.target.id} is running with PID: {running_process.pid}"
+        )
+
+        self.logger.info(
+            f"Waiting for the unikernel to start...{self.test_run_config.get('UnikernelBootupTime', 10)} seconds"
+        )
+        self._wait_for_unikernel(running_process, run_config)
+
+        if (
+            self.test_run_config["TestingType"] == "curl"
+            or self.test_run_config["TestingType"] == "list-of-commands"
+        ):
+            if self.test_run_config["TestingType"] == "curl":
+                # Complete the curl test
+                run_return_code, run_log = self._test_curl_run(run_config)
+            else:
+                # complete the list of commands test
+                run_return_code, run_log = self._test_list_of_commands_run(run_config)
+            # Kill the running process
+            self._stop_unikernel(running_process)
+            self.logger.info(
+                f"[✓] Target {self.target.id} with PID: {running_process.pid} has been terminated"
+            )
+
+            # Now I need to validate the test
+            output_matched = self._validate_run(run_log)
+
+            # Update the run log file
+            self._write_log_file(run_config.dir, "complete_run.log", run_log, mode="w")
+        else:
+            # Kill the running process
+            self._stop_unikernel(running_process)
+            self.logger.info(
+                f"[✓] Target {self.target.id} with PID: {running_process.pid} has been terminated"
+            )
+            # Test for no commands
+            run_return_code, output_matched = self._test_no_commands_run(run_config)
+
+        # Update the run report
+        self._update_run_report(run_config, self.target.id, run_return_code, output_matched)
+
+        # Terminate buildkitd process after each kraft-based run
+        if self.target.config['build']['build_tool'] == 'kraft':
+            self._terminate_buildkitd()
+            self.logger.info(f"[✓] Terminated buildkitd process after kraft-based run {idx + 1} for target: {self.target.id}")
+
     def run_test(self) -> None:
         """
         Run the test for the target setup.
@@ -467,7 +881,28 @@ class TestRunner(Loggable):
         This method will execute the build and run configurations for the target.
         """
         self.logger.info(f"Running tests for target: {self.target.id}")
-        
+        build_return_code, build_success = self.build_test()
+        self.run_configs_test(build_return_code, build_success)
+
+    def uses_shared_builder(self) -> bool:
+        """
+        Check whether the target build relies on state shared with other builds.
+
+        Kraft builds go through the buildkitd daemon and the local registry, which
+        are restarted around every build, so they can not overlap with each other.
+
+        Returns:
+            bool: True if the target must be built alone, False otherwise
+        """
+        return self.target.config['build']['build_tool'] == 'kraft'
+
+    def build_test(self) -> tuple[int, bool]:
+        """
+        Build the target and record the result in the build report.
+
+        Returns:
+            tuple[int, bool]: The build return code and whether the kernel was built
+        """
         build_return_code, build_success = 0, True
         if self.target.build_config.is_example and self.target.config['build']['build_tool'] == 'make':
             pass
@@ -479,64 +914,73 @@ class TestRunner(Loggable):
             build_success = self._test_target_build(self.target.build_config.kernel_path)
             # Update the build status in the test-app-config/build_report.csv
             self._update_build_report(self.target, build_return_code, build_success)
+        return build_return_code, build_success
+
+    def run_configs_test(self, build_return_code: int, build_success: bool) -> None:
+        """
+        Run every run configuration of the target once its build is done.
+
+        Args:
+            build_return_code: Return code of the target build
+            build_success: Whether the target kernel was built
+        """
         # WARNING: TODO: Update the condition after keeping runtime_kernel created by kraft fetched by oci registry 
         if build_return_code == 0 and build_success or (self.target.build_config.is_example and self.target.config['build']['build_tool'] == 'kraft'):
             self.logger.info(f"[✓] Build successful for target: {self.target.id}")
 
             # Iterate over each of the runs
             for idx, run_config in enumerate(self.target.run_configs):
-
-                self.logger.info(f"Running configuration: {run_config.dir}")
-                # self.logger.info(f"\tRun configuration of {idx + 1} is {run_config.config}")
-                running_process = self._run_target(run_config.dir)
-                self.logger.info(
-                    f"[✓] Target {self.target.id} is running with PID: {running_process.pid}"
-                )
-
-                self.logger.info(
-                    f"Waiting for the unikernel to start...{self.test_run_config.get('UnikernelBootupTime', 10)} seconds"
-                )
-                time.sleep(self.test_run_config.get("UnikernelBootupTime", 10))
-
-                if (
-                    self.test_run_config["TestingType"] == "curl"
-                    or self.test_run_config["TestingType"] == "list-of-commands"
-                ):
-                    if self.test_run_config["TestingType"] == "curl":
-                        # Complete the curl test
-                        run_return_code, run_log = self._test_curl_run(run_config)
-                    else:
-                        # complete the list of commands test
-                        run_return_code, run_log = self._test_list_of_commands_run(run_config)
-                    # Kill the running process
-                    running_process.terminate()
-                    self.logger.info(
-                        f"[✓] Target {self.target.id} with PID: {running_process.pid} has been terminated"
-                    )
-                else:
-                    # Kill the running process
-                    running_process.terminate()
-                    self.logger.info(
-                        f"[✓] Target {self.target.id} with PID: {running_process.pid} has been terminated"
-                    )
-                    # Test for no commands
-                    run_return_code, run_log = self._test_no_commands_run()
-
-                # Now I need to validate the test
-                output_matched = self._validate_run(run_log)
-
-                # Update the run log file
-                self._write_log_file(run_config.dir, "complete_run.log", run_log, mode="w")
-
-                # Update the run report
-                self._update_run_report(run_config, self.target.id, run_return_code, output_matched)
-
-                # Terminate buildkitd process after each kraft-based run
-                if self.target.config['build']['build_tool'] == 'kraft':
-                    self._terminate_buildkitd()
-                    self.logger.info(f"[✓] Terminated buildkitd process after kraft-based run {idx + 1} for target: {self.target.id}")
+                self._run_config_test(idx, run_config)
 
         else:
             self.logger.info(f"[✗] Build failed for target: {self.target.id}")
 
         return
+
+
+def run_all_tests(runners: list[TestRunner], max_workers: Optional[int] = None) -> None:
+    """
+    Run the tests of several targets, optionally building them concurrently.
+
+    Without max_workers every target is built and then run before the next one
+    starts, so a build never competes with another build or with a run. Each build
+    already runs make with one job per CPU and keeps its own th_time timeout.
+
+    With max_workers, make builds of different targets, which write into their own
+    directories and only wait on their build subprocess, are dispatched to a
+    bounded thread pool. Kraft builds share the buildkitd daemon and are done one
+    at a time, only once no pool build is left. The runs of a target start as soon
+    as its build is done, and stay sequential across targets, see
+    TestRunner._run_config_test.
+
+    Args:
+        runners: The test runners, in the order their runs should happen
+        max_workers: Maximum number of concurrent builds, None to test the targets
+            one after the other
+    """
+    if not max_workers:
+        for runner in runners:
+            runner.run_test()
+        return
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        builds = [
+            None if runner.uses_shared_builder() else executor.submit(runner.build_test)
+            for runner in runners
+        ]
+        pool_builds = [build for build in builds if build is not None]
+        for runner, build in zip(runners, builds):
+            runner.logger.info(f"Running tests for target: {runner.target.id}")
+            if build is None:
+                # A shared builder build runs alone, after every pool build
+                wait(pool_builds)
+                build_return_code, build_success = runner.build_test()
+            else:
+                build_return_code, build_success = build.result()
+            runner.run_configs_test(build_return_code, build_success)
+    except BaseException:
+        # Queued builds are dropped, so an error or Ctrl-C is reported right away
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
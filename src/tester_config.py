@@ -3,11 +3,12 @@ This module provide the TesterConfig class to retrive and store tester configura
 """
 
 import itertools
+import operator
 import sys
-
-import yaml
+from collections import defaultdict
 
 from utils.base import Loggable
+from utils.yaml_fast import safe_load
 
 
 class TesterConfig(Loggable):
@@ -23,10 +24,10 @@ class TesterConfig(Loggable):
         super().__init__()
         try:
             with open(variants_file, "r", encoding="utf8") as stream:
-                self.config = yaml.safe_load(stream)
+                self.config = safe_load(stream)
                 with open(config_file, "r", encoding="utf8") as stream:
-                    self.config.update(yaml.safe_load(stream))
-                self.variants = self._generate_variants()
+                    self.config.update(safe_load(stream))
+                self.variants = list(self._generate_variants())
                 self.target_configs = []
             
         except IOError:
@@ -38,33 +39,20 @@ class TesterConfig(Loggable):
         Create all combinations of values from the 'variants' dictionary in
         the tester configuration file.
 
-        Each variant is a dictionary, e.g.
-        {'arch': 'x86_64', 'hypervisor': 'kvm', 'platform': 'qemu', ...}
+        Variants are kept as tuples of values, in the order of the keys of
+        the build and run sections, e.g.
+        ('x86_64', 'qemu', 'make', ...)
 
-        Return a list of all variants.
+        Return the build keys, a generator of build value tuples, the run keys
+        and a list of run value tuples.
         """
 
         build_variants = self.config["variants"]["build"]
         run_variants = self.config["variants"]["run"]
-        build_configs = list(
-            dict(zip(build_variants.keys(), values))
-            for values in itertools.product(*build_variants.values())
-        )
-        run_configs = list(
-            dict(zip(run_variants.keys(), values))
-            for values in itertools.product(*run_variants.values())
-        )
+        build_values = itertools.product(*build_variants.values())
+        run_values = list(itertools.product(*run_variants.values()))
 
-        full_variants = []
-        for b in build_configs:
-            new_variant = {}
-            new_variant["build"] = b
-            new_variant["runs"] = []
-            for r in run_configs:
-                new_variant["runs"].append(r)
-            full_variants.append(new_variant)
-
-        return full_variants
+        return tuple(build_variants), build_values, tuple(run_variants), run_values
 
     def _get_exclude_variants(self):
         """Get variants to be excluded from all possible variants.
@@ -113,53 +101,107 @@ class TesterConfig(Loggable):
         variants (with _get_exlude_variants()).
 
         An exclude variant is a dictionary. A variant is a dictionary with a
-        build configuration and an array of run configurations.
+        build configuration and an array of run configurations. Variants are
+        matched as value tuples and only the valid ones are turned into
+        dictionaries.
 
-        Return list of variants, i.e. a subset of full_variants.
+        Yield the valid variants, i.e. a subset of full_variants.
         """
 
-        exclude_variants = self._get_exclude_variants()
-        full_variants = self._generate_full_variants()
-        ret_variants = []
+        build_keys, build_values, run_keys, run_values = self._generate_full_variants()
+        exclude_index = self._index_exclude_variants(self._get_exclude_variants())
+        build_checks = self._compile_exclude_checks(exclude_index, build_keys)
+        # Groups constraining only build keys already matched the build variant
+        # and need not be checked again for each of its run variants.
+        run_checks = self._compile_exclude_checks(
+            {keys: e for keys, e in exclude_index.items() if not keys.isdisjoint(run_keys)},
+            build_keys + run_keys,
+        )
+        # The run configurations are shared by all variants and must not be modified.
+        run_configs = [dict(zip(run_keys, r)) for r in run_values]
 
-        for f in full_variants:
+        for b in build_values:
             # First check if entire build variant is to be excluded
             # (together # with all its run variants).
-            b = f["build"]
-            for e in exclude_variants:
-                excluded = True
-                for k, v in e.items():
-                    if k in b.keys():
-                        if b[k] != v:
-                            excluded = False
-                            break
-                    else:
-                        excluded = False
-                        break
-                if excluded:
-                    break
-            if excluded:
+            if self._is_excluded(b, build_checks):
                 continue
 
             # Check for run variants to be excluded.
-            run_variants = []
-            for r in f["runs"]:
-                linear_variant = {**b, **r}
-                excluded = True
-                for e in exclude_variants:
-                    excluded = True
-                    for k, v in e.items():
-                        if linear_variant[k] != v:
-                            excluded = False
-                            break
-                    if excluded:
-                        break
-                if excluded:
-                    continue
-                run_variants.append(r)
-            ret_variants.append({"build": b, "runs": run_variants})
+            run_variants = [
+                config
+                for r, config in zip(run_values, run_configs)
+                if not self._is_excluded(b + r, run_checks)
+            ]
+            yield {"build": dict(zip(build_keys, b)), "runs": run_variants}
+
+    @staticmethod
+    def _index_exclude_variants(exclude_variants):
+        """Index exclude variants by the keys they constrain.
+
+        Exclude variants constraining the same keys are grouped together, so a
+        variant is checked against each group with a single set lookup.
+
+        Return a dictionary mapping a frozenset of keys to the set of excluded
+        value combinations, each stored as a frozenset of (key, value) items.
+        """
+
+        exclude_index = defaultdict(set)
+        for e in exclude_variants:
+            exclude_index[frozenset(e)].add(frozenset(e.items()))
+
+        return exclude_index
 
-        return ret_variants
+    @staticmethod
+    def _compile_exclude_checks(exclude_index, keys):
+        """Turn the exclude index into checks on value tuples.
+
+        The value tuples hold the values of keys, in order. When a key appears
+        more than once, its last value is used, as when merging dictionaries.
+        Groups constraining a key missing from keys can never match and are
+        dropped.
+
+        Return a list of (getter, excluded) pairs. The getter picks the
+        constrained values out of a value tuple and excluded is the set of
+        their excluded combinations.
+        """
+
+        position = {k: i for i, k in enumerate(keys)}
+        checks = []
+        for group, excluded in exclude_index.items():
+            if not group <= position.keys():
+                continue
+            group_keys = tuple(group)
+            checks.append(
+                (
+                    operator.itemgetter(*(position[k] for k in group_keys)),
+                    {
+                        # A single key getter returns the bare value, not a tuple.
+                        values[0] if len(values) == 1 else values
+                        for values in (
+                            tuple(dict(items)[k] for k in group_keys) for items in excluded
+                        )
+                    },
+                )
+            )
+
+        return checks
+
+    @staticmethod
+    def _is_excluded(values, checks):
+        """Check if a variant matches an exclude variant.
+
+        A variant matches an exclude variant if it has all the keys of the
+        exclude variant, with the same values. The variant is given as a
+        value tuple and checks as returned by _compile_exclude_checks().
+
+        Return true or false.
+        """
+
+        for getter, excluded in checks:
+            if getter(values) in excluded:
+                return True
+
+        return False
 
     def _generate_compilers(self, plat, arch, sys_compilers):
         """Generate compiler configurations.
@@ -222,50 +264,55 @@ class TesterConfig(Loggable):
         {'arch': 'x86_64', ..., 'base': '...', 'compiler': '...' }'
         """
 
+        base = self.config["source"]["base"]
+        vmm_list = self._generate_vmms(plat, arch, sys_vmms)
+        comp_list = self._generate_compilers(plat, arch, sys_compilers)
+
         for v in self.variants:
+            base_build = v["build"]
             for b in build_tools:
                 if not (
-                    plat == v["build"]["platform"]
-                    and arch == v["build"]["arch"]
-                    and b == v["build"]["build_tool"]
+                    plat == base_build["platform"]
+                    and arch == base_build["arch"]
+                    and b == base_build["build_tool"]
                 ):
                     continue
 
-                vmm_list = self._generate_vmms(plat, arch, sys_vmms)
-                comp_list = self._generate_compilers(plat, arch, sys_compilers)
                 if not comp_list:
                     continue
                 # Currently, Kraft can only build using GCC.
                 # So, irrespective of the available compilers, generate only
                 # one Kraft build target.
-                if b == "kraft":
-                    comp_list = [{"type": "gcc", "path": "default"}]
-                for comp in comp_list:
-                    _config = {}
-                    _config["build"] = v["build"].copy()
-                    _config["base"] = self.config["source"]["base"]
-
-                    _config["build"]["compiler"] = comp
-
+                build_comps = [{"type": "gcc", "path": "default"}] if b == "kraft" else comp_list
+
+                # The runs do not depend on the compiler or the VMM, filter them once.
+                runs = [
+                    r
+                    for r in v["runs"]
+                    if r["run_tool"] in run_tools
+                    and (r["hypervisor"] == "none" or arch == sys_arch)
+                ]
+
+                # Every target gets its own build dictionary, built in a single step.
+                for comp in build_comps:
                     if not vmm_list:
-                        _config["run"] = {}
-                        _config["run"]["vmm"] = None
-                        _config["run"]["runs"] = []
-                        self.target_configs.append(_config)
+                        self.target_configs.append(
+                            {
+                                "build": {**base_build, "compiler": comp},
+                                "base": base,
+                                "run": {"vmm": None, "runs": []},
+                            }
+                        )
                         continue
 
                     for vmm in vmm_list:
-                        _config["run"] = {}
-                        _config["run"]["vmm"] = vmm
-                        _config["run"]["runs"] = []
-                        for r in v["runs"]:
-                            for rt in run_tools:
-                                if rt == r["run_tool"]:
-                                    if r["hypervisor"] == "none" or (
-                                        r["hypervisor"] != "none" and arch == sys_arch
-                                    ):
-                                        _config["run"]["runs"].append(r)
-                        self.target_configs.append(_config)
+                        self.target_configs.append(
+                            {
+                                "build": {**base_build, "compiler": comp},
+                                "base": base,
+                                "run": {"vmm": vmm, "runs": runs},
+                            }
+                        )
 
     def get_target_configs(self):
         """Retrieve target configurations."""
@@ -1,138 +1,314 @@
+import functools
+import json
+import logging
 import os
-import yaml
 import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from .process_utils import terminate_buildkitd
+from .yaml_fast import safe_load
 
-def create_examples_runtime(selected_targets, targets, runtime_name) -> None:
+logger = logging.getLogger("test_framework")
+
+# Kernel names derived from each config.yaml, kept across sessions. It lives next to
+# the built kernels, writing it inside .runtime_tests would change the mtime that
+# _load_runtime_configs is cached on.
+CONFIG_CACHE_FILE = os.path.join("runtime_kernels", ".config_cache.json")
+
+def _read_config_cache(cache_path: str) -> dict:
     """
-    Create the key target runtimes for example applications.
-    This function generates the runtime kernel and other necessary files
-    for the selected targets.
+    Read the kernel name cache, an empty cache is returned if it is missing or unreadable.
+    """
+    try:
+        with open(cache_path, "r") as cache_file:
+            cache = json.load(cache_file)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+def _write_config_cache(cache_path: str, cache: dict) -> None:
+    """
+    Write the kernel name cache atomically, failing to write it is not an error.
     """
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w") as cache_file:
+            json.dump(cache, cache_file)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning("Could not write config cache %s: %s", cache_path, e)
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
 
+@functools.lru_cache(maxsize=1)
+def _load_runtime_configs(runtime_tests_dir: str, mtime_ns: int) -> dict:
     """
-    Traverse each of the subdirectory in .runtime_tests
+    Traverse each of the subdirectory in runtime_tests_dir
     example .runtime_tests/00001 and load the content of the config.yaml file present in that directory
     following after that add that config data into a dictionary of loaded config data: path to that config file
+
+    The result is cached, mtime_ns is the modification time of runtime_tests_dir so
+    that adding or removing a runtime test invalidates it. The kernel name of each
+    config.yaml is also stored in CONFIG_CACHE_FILE, keyed by its modification time
+    and size, so unchanged configs are not parsed again in later sessions.
     """
-    loaded_configs = {}  # Dictionary to store config data: path -> config content
+    loaded_configs = {}  # Kernel name -> (build script path, runtime test directory)
+
+    cache_path = CONFIG_CACHE_FILE
+    cache = _read_config_cache(cache_path)
+    new_cache = {}
+
+    # The entry type comes from the directory listing, no extra stat per entry
+    with os.scandir(runtime_tests_dir) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                config_path = os.path.join(entry.path, "config.yaml")
+                runtime_kernel_build_path = os.path.join(entry.path, "build")
+                try:
+                    config_stat = os.stat(config_path)
+                except FileNotFoundError:
+                    continue
+
+                cached = cache.get(entry.name)
+                if cached and cached[:2] == [config_stat.st_mtime_ns, config_stat.st_size]:
+                    kernel_name = cached[2]
+                else:
+                    with open(config_path, "r") as config_file:
+                        config_data = safe_load(config_file)
+                        kernel_name = generate_kernel_name(config_data)
+                new_cache[entry.name] = [config_stat.st_mtime_ns, config_stat.st_size, kernel_name]
+                loaded_configs[kernel_name] = (runtime_kernel_build_path, entry.path)
+
+    if new_cache != cache:
+        _write_config_cache(cache_path, new_cache)
+
+    return loaded_configs
+
+def _create_make_runtime(
+    build_script_path: str, runtime_test_dir: str, destination_kernel_path: str
+) -> None:
+    """
+    Build a make based runtime kernel and move it to its destination.
+    The build output goes to build.log next to the build script so that
+    concurrent builds do not interleave their output.
+    """
+    log_path = os.path.join(os.path.dirname(build_script_path), "build.log")
+    logger.info("Building %s, output in %s", build_script_path, log_path)
+    with open(log_path, "wb") as log_file:
+        subprocess.run(
+            ["bash", build_script_path], stdout=log_file, stderr=subprocess.STDOUT, check=True
+        )
+
+    # Move the kernel to the desired location
+    cwd = os.getcwd()
+    build_dir = os.path.join(cwd, runtime_test_dir, ".unikraft", "build")
+    kernel_filename = find_qemu_x86_64_kernel_file(build_dir)
+    source_kernel_path = os.path.join(build_dir, kernel_filename)
+    logger.debug("Source kernel path: %s", source_kernel_path)
+
+    # The kernel file was just found in build_dir, no need to check it again
+    _move_file(source_kernel_path, destination_kernel_path)
+    logger.info("Kernel moved to %s", destination_kernel_path)
+
+def create_examples_runtime(selected_targets, targets, runtime_name, max_workers=None) -> None:
+    """
+    Create the key target runtimes for example applications.
+    This function generates the runtime kernel and other necessary files
+    for the selected targets.
+
+    Make builds are independent of each other and can run concurrently, at most
+    max_workers at a time. Each build already runs make with one job per CPU, so
+    without max_workers they run one after the other. Kraft builds share the
+    buildkitd daemon and the local registry tag, so they always run one at a time,
+    after the make builds.
+    """
+
+    # Define the destination path once and ensure runtime_name directory exists
+    destination_dir = os.path.join(os.getcwd(), "runtime_kernels", runtime_name)
+    os.makedirs(destination_dir, exist_ok=True)
+    # Kraft kernels are pulled next to their destination, so moving them is a rename
+    tmp_kernel_dir = os.path.join(os.path.dirname(destination_dir), ".tmp-kernel")
+
+    # Membership is checked once per target, the selection is usually a list
+    selected_set = set(selected_targets)
+    # Kernels already in the destination, from one directory read instead of a stat per target
+    with os.scandir(destination_dir) as entries:
+        existing = {entry.name for entry in entries}
+
+    # Kernels still to be created, in target order: kernel name -> (target, build tool)
+    needed = {}
+    for target in targets:
+        if target.id - 1 not in selected_set:
+            continue
+
+        example_target_config = target.config['build']
+        logger.debug("Processing target %s with config: %s", target.id, example_target_config)
+        runtime_kernel_name = generate_kernel_name(example_target_config)
+
+        # Check if this runtime_kernel is already created or needed by a previous target
+        if runtime_kernel_name in existing:
+            logger.info(
+                "Runtime kernel %s already exists at %s, skipping generation",
+                runtime_kernel_name,
+                os.path.join(destination_dir, runtime_kernel_name),
+            )
+            continue
+        if runtime_kernel_name not in needed:
+            needed[runtime_kernel_name] = (target, example_target_config['build_tool'])
+
+    # Nothing to build, the runtime tests do not even have to be looked at
+    if not needed:
+        return
 
     # Processing all the runtime_kernels configs and build path
     runtime_tests_dir = ".runtime_tests"
-    for subdir in os.listdir(runtime_tests_dir):
-        subdir_path = os.path.join(runtime_tests_dir, subdir)
-        if os.path.isdir(subdir_path):
-            config_path = os.path.join(subdir_path, "config.yaml")
-            runtime_kernel_build_path = os.path.join(subdir_path, "build")
-            if os.path.exists(config_path):
-                with open(config_path, "r") as config_file:
-                    config_data = yaml.safe_load(config_file)
-                    kernel_name = generate_kernel_name(config_data)
-                    loaded_configs[kernel_name] = runtime_kernel_build_path
+    loaded_configs = _load_runtime_configs(
+        runtime_tests_dir, os.stat(runtime_tests_dir).st_mtime_ns
+    )
 
+    # (Runtime kernel name, build script, runtime test directory, destination) of each
+    # make build, the other builds also hold their build tool after the kernel name
+    make_builds, other_builds = [], []
+    for runtime_kernel_name, (target, build_tool) in needed.items():
+        destination_kernel_path = os.path.join(destination_dir, runtime_kernel_name)
 
-    for target in targets:
-        print(f"Processing target {target.id} and searching in {selected_targets}")
-        if target.id - 1 in selected_targets:
-            example_target_config = target.config['build']
-            print(f"Processing target {target.id} with config: {example_target_config}")
-            runtime_kernel_name = generate_kernel_name(example_target_config)
-            build_tool = target.config['build']['build_tool']
-            # Check if given kernel is to be build or not
-            if runtime_kernel_name in loaded_configs:
-                runtime_kernel_build_path = loaded_configs[runtime_kernel_name]
-                
-                # Define the destination path early and ensure runtime_name directory exists
-                destination_dir = os.path.join(os.getcwd(), "runtime_kernels", runtime_name)
-                os.makedirs(destination_dir, exist_ok=True)
-                destination_kernel_path = os.path.join(destination_dir, runtime_kernel_name)
-                
-                # Check if this runtime_kernel is already created
-                if os.path.exists(destination_kernel_path):
-                    print(f"Runtime kernel {runtime_kernel_name} already exists at {destination_kernel_path}, skipping generation")
-                    continue
-                
-                # Call the build script
-                build_script_path = runtime_kernel_build_path
-                if os.path.exists(build_script_path):
-                    subprocess.run(["bash", build_script_path], check=True)
-                    
-                    # Terminate buildkitd process after build script execution
-                    if build_tool == "kraft":
-                        terminate_buildkitd()
-                else:
-                    print(f"Build script not found at {build_script_path}")
-                    continue
+        # Check if given kernel is to be build or not
+        if runtime_kernel_name not in loaded_configs:
+            logger.warning(
+                "No configuration found for target %s with kernel name %s",
+                target.id,
+                runtime_kernel_name,
+            )
+            continue
+
+        build_script_path, runtime_test_dir = loaded_configs[runtime_kernel_name]
+        # bash reports a missing script as exit status 127, not ENOENT, so this check stays
+        if not os.path.exists(build_script_path):
+            logger.warning("Build script not found at %s", build_script_path)
+            continue
+
+        if build_tool == "make":
+            make_builds.append(
+                (runtime_kernel_name, build_script_path, runtime_test_dir, destination_kernel_path)
+            )
+        else:
+            other_builds.append(
+                (
+                    runtime_kernel_name,
+                    build_tool,
+                    build_script_path,
+                    runtime_test_dir,
+                    destination_kernel_path,
+                )
+            )
+
+    failed = []
+    if max_workers:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = [
+                (build[0], executor.submit(_create_make_runtime, *build[1:]))
+                for build in make_builds
+            ]
+            for runtime_kernel_name, future in futures:
+                try:
+                    future.result()
+                except (subprocess.CalledProcessError, OSError) as e:
+                    logger.error(
+                        "Error while creating runtime kernel %s: %s", runtime_kernel_name, e
+                    )
+                    failed.append(runtime_kernel_name)
+        except BaseException:
+            # Queued builds are dropped, so an error or Ctrl-C is reported right away
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+    else:
+        for runtime_kernel_name, *build in make_builds:
+            try:
+                _create_make_runtime(*build)
+            except (subprocess.CalledProcessError, OSError) as e:
+                logger.error("Error while creating runtime kernel %s: %s", runtime_kernel_name, e)
+                failed.append(runtime_kernel_name)
+
+    logger.info(
+        "Created %d of %d make runtime kernels", len(make_builds) - len(failed), len(make_builds)
+    )
 
-                
-
-                # Separate both the make and kraft logic differently
-                if build_tool == "make":
-                    # Move the kernel to the desired location
-                    cwd = os.getcwd()
-                    build_dir = os.path.join(cwd, runtime_kernel_build_path.split("/build")[0], ".unikraft", "build")
-                    kernel_filename = find_qemu_x86_64_kernel_file(build_dir)
-                    source_kernel_path = os.path.join(build_dir, kernel_filename)
-                    print(f"Source kernel path: {source_kernel_path}")
-                    
-                    if os.path.exists(source_kernel_path):
-                        shutil.move(source_kernel_path, destination_kernel_path)
-                        print(f"Kernel moved to {destination_kernel_path}")
-                    else:
-                        print(f"Kernel not found at {source_kernel_path}")
-                elif build_tool == "kraft":
-                    # Kraft specific logic
-                    try:
-                        # Package the image
-                        package_cmd = [
-                            "kraft", "pkg", "--as", "oci", 
-                            "--name", f"localhost:5000/{runtime_name}:local", runtime_kernel_build_path.split("/build")[0]
-                        ]
-                        subprocess.run(package_cmd, check=True)
-                        print(f"Successfully packaged kernel {runtime_kernel_name}")
-                        
-                        # Push it to the repo
-                        push_cmd = [
-                            "kraft", "pkg", "push", 
-                            f"localhost:5000/{runtime_name}:local", runtime_kernel_build_path.split("/build")[0]
-                        ]
-                        subprocess.run(push_cmd, check=True)
-                        print(f"Successfully pushed kernel {runtime_kernel_name} to repository")
-                        
-                        # Pull the image to temporary directory
-                        tmp_kernel_dir = ".tmp-kernel"
-                        pull_cmd = [
-                            "kraft", "pkg", "pull", "-w", tmp_kernel_dir,
-                            f"localhost:5000/{runtime_name}:local"
-                        ]
-                        subprocess.run(pull_cmd, check=True)
-                        print(f"Successfully pulled kernel {runtime_kernel_name}")
-                        
-                        # Move kernel file to destination
-                        cwd = os.getcwd()
-                        source_kernel = os.path.join(cwd, tmp_kernel_dir, "unikraft", "bin", "kernel")
-                        
-                        if os.path.exists(source_kernel):
-                            shutil.move(source_kernel, destination_kernel_path)
-                            print(f"Kernel moved to {destination_kernel_path}")
-                        else:
-                            print(f"Kernel not found at {source_kernel}")
-                        
-                        # Clean up temporary directory
-                        if os.path.exists(tmp_kernel_dir):
-                            shutil.rmtree(tmp_kernel_dir)
-                            print(f"Cleaned up temporary directory {tmp_kernel_dir}")
-                        
-                    except subprocess.CalledProcessError as e:
-                        print(f"Error during kraft packaging/push/pull for {runtime_kernel_name}: {e}")
-                        # Clean up temporary directory in case of error
-                        if os.path.exists(".tmp-kernel"):
-                            shutil.rmtree(".tmp-kernel")
-                        continue
-                
-            else:
-                print(f"No configuration found for target {target.id} with kernel name {runtime_kernel_name}")
+    # The other builds run one at a time, once no make build is left
+    for (
+        runtime_kernel_name,
+        build_tool,
+        build_script_path,
+        runtime_test_dir,
+        destination_kernel_path,
+    ) in other_builds:
+        # Call the build script
+        subprocess.run(["bash", build_script_path], check=True)
+
+        if build_tool == "kraft":
+            _create_kraft_runtime(
+                runtime_kernel_name,
+                runtime_test_dir,
+                destination_kernel_path,
+                runtime_name,
+                tmp_kernel_dir,
+            )
+
+    if failed:
+        raise RuntimeError(f"Failed to create runtime kernels: {', '.join(failed)}")
+
+def _create_kraft_runtime(
+    runtime_kernel_name: str,
+    runtime_test_dir: str,
+    destination_kernel_path: str,
+    runtime_name: str,
+    tmp_kernel_dir: str,
+) -> None:
+    """
+    Package a kraft built runtime kernel, push it to the local registry and pull
+    it back to its destination.
+    """
+    # Terminate buildkitd process after build script execution
+    terminate_buildkitd()
+
+    # Kraft specific logic
+    try:
+        # Package the image and push it to the repo in a single kraft run
+        package_cmd = [
+            "kraft", "pkg", "--as", "oci", "--push",
+            "--name", f"localhost:5000/{runtime_name}:local", runtime_test_dir
+        ]
+        subprocess.run(package_cmd, check=True)
+        logger.info("Packaged and pushed kernel %s to repository", runtime_kernel_name)
+
+        # Pull the image to temporary directory
+        pull_cmd = [
+            "kraft", "pkg", "pull", "-w", tmp_kernel_dir,
+            f"localhost:5000/{runtime_name}:local"
+        ]
+        subprocess.run(pull_cmd, check=True)
+        logger.info("Successfully pulled kernel %s", runtime_kernel_name)
+
+        # Move kernel file to destination
+        source_kernel = os.path.join(tmp_kernel_dir, "unikraft", "bin", "kernel")
+
+        try:
+            _move_file(source_kernel, destination_kernel_path)
+            logger.info("Kernel moved to %s", destination_kernel_path)
+        except FileNotFoundError:
+            logger.warning("Kernel not found at %s", source_kernel)
+
+        # Clean up temporary directory
+        shutil.rmtree(tmp_kernel_dir, ignore_errors=True)
+        logger.debug("Cleaned up temporary directory %s", tmp_kernel_dir)
+
+    except subprocess.CalledProcessError as e:
+        logger.error("Error during kraft packaging/push/pull for %s: %s", runtime_kernel_name, e)
+        # Clean up temporary directory in case of error
+        shutil.rmtree(tmp_kernel_dir, ignore_errors=True)
 
 def generate_kernel_name(config_data: dict) -> str:
     """
@@ -142,28 +318,39 @@ def generate_kernel_name(config_data: dict) -> str:
     """
     # TODO: Raise error if we didnt receive some keys in config_data
     # Extract required parameters from the config data
-    arch = config_data.get("arch", "")
-    bootloader = config_data.get("bootloader", "")
-    build_tool = config_data.get("build_tool", "")
-    compiler_type = config_data.get("compiler", {}).get("type", "")
-    debug = config_data.get("debug", "")
-    platform = config_data.get("platform", "")
+    get = config_data.get
+    compiler = get("compiler")
 
-    # Create the kernel name string
-    kernel_name = f"{arch}_{bootloader}_{build_tool}_{compiler_type}_{debug}_{platform}"
-    return kernel_name
+    # Create the kernel name string, a single f-string formats every value in one pass
+    return (
+        f"{get('arch', '')}_{get('bootloader', '')}_{get('build_tool', '')}_"
+        f"{compiler.get('type', '') if compiler else ''}_{get('debug', '')}_{get('platform', '')}"
+    )
+
+def _move_file(source: str, destination: str) -> None:
+    """
+    Move a file with a single rename, copying it only when the source and the
+    destination are on different filesystems.
+    """
+    try:
+        os.rename(source, destination)
+    except FileNotFoundError:
+        raise
+    except OSError:
+        shutil.move(source, destination)
 
 def find_qemu_x86_64_kernel_file(build_dir: str) -> str:
     """
     List all files in build_dir and return the file that contains 'qemu-x86_64' in its name,
     does not have an extension, and is a file.
     """
-    for fname in os.listdir(build_dir):
-        fpath = os.path.join(build_dir, fname)
-        if (
-            os.path.isfile(fpath)
-            and "qemu-x86_64" in fname
-            and "." not in fname
-        ):
-            return fname
+    with os.scandir(build_dir) as entries:
+        for entry in entries:
+            # Check the name first, the file type only for the candidates
+            if (
+                "qemu-x86_64" in entry.name
+                and "." not in entry.name
+                and entry.is_file(follow_symlinks=False)
+            ):
+                return entry.name
     raise FileNotFoundError(f"No qemu-x86_64 kernel file found in {build_dir}")
@@ -2,11 +2,42 @@
 This module is responsible for copying common template scripts to the test directory.
 """
 
+import errno
 import os
 import shutil
 
 from constants import SCRIPT_DIR, TESTS_FOLDER
 
+# copy_file_range failures meaning it can not be used for these two files
+_COPY_FILE_RANGE_UNSUPPORTED = {errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP}
+
+
+def _fast_copy(src, dst):
+    """Copy a file and its metadata, like shutil.copy2.
+
+    The data is copied with os.copy_file_range, inside the kernel, which lets
+    filesystems supporting it share the data instead of duplicating it. Where
+    it is not available shutil.copy2 is used.
+    """
+    if not hasattr(os, "copy_file_range"):
+        return shutil.copy2(src, dst)
+
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+    except OSError as e:
+        if e.errno not in _COPY_FILE_RANGE_UNSUPPORTED:
+            raise
+        return shutil.copy2(src, dst)
+
+    shutil.copystat(src, dst)
+    return dst
+
 
 def copy_common():
     """Copy all common scripts to the test directory.
@@ -19,15 +50,20 @@ def copy_common():
     src = os.path.join(os.getcwd(), SCRIPT_DIR, "common")
     os.makedirs(dest, exist_ok=True)
 
-    for item in os.listdir(src):
-        src_path = os.path.join(src, item)
-        dest_path = os.path.join(dest, item)
-
-        if os.path.isdir(src_path):
-            shutil.copytree(src_path, dest_path, dirs_exist_ok=True)
-        else:
-            if (
-                not os.path.exists(dest_path)
-                or os.stat(src_path).st_mtime > os.stat(dest_path).st_mtime
-            ):
-                shutil.copy2(src_path, dest_path)
+    # Directory listings give the entry types and which files already exist, only
+    # files present on both sides are stat'ed to compare modification times
+    with os.scandir(dest) as entries:
+        dest_entries = {entry.name: entry for entry in entries}
+
+    with os.scandir(src) as entries:
+        for entry in entries:
+            dest_path = os.path.join(dest, entry.name)
+
+            if entry.is_dir():
+                shutil.copytree(
+                    entry.path, dest_path, copy_function=_fast_copy, dirs_exist_ok=True
+                )
+            else:
+                dest_entry = dest_entries.get(entry.name)
+                if dest_entry is None or entry.stat().st_mtime > dest_entry.stat().st_mtime:
+                    _fast_copy(entry.path, dest_path)
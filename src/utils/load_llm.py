@@ -2,7 +2,6 @@ import os
 from typing import Optional
 
 from dotenv import load_dotenv
-from langchain.chat_models import init_chat_model
 
 
 class LLMLoader:
@@ -10,6 +9,12 @@ class LLMLoader:
     A class to handle LLM model loading and configuration.
     """
 
+    # Chat model clients shared by all loaders, by (model_name, model_provider)
+    _clients = {}
+    # The .env file is read by the first loader, providers are checked once each
+    _dotenv_loaded = False
+    _checked_providers = set()
+
     def __init__(
         self,
         model_name: str = "llama-3.3-70b-versatile",
@@ -33,11 +38,20 @@ class LLMLoader:
     def _setup_api_key(self) -> None:
         """
         Setup API key for the model provider by loading from .env file.
+
+        The .env file is only loaded once per process and a provider whose key
+        was found is not checked again.
         """
+        provider = self.model_provider.lower()
+        if provider in LLMLoader._checked_providers:
+            return
+
         # Load environment variables from .env file
-        load_dotenv()
+        if not LLMLoader._dotenv_loaded:
+            load_dotenv()
+            LLMLoader._dotenv_loaded = True
 
-        if self.model_provider.lower() == "groq":
+        if provider == "groq":
             api_key = os.environ.get("GROQ_API_KEY")
             if not api_key:
                 raise ValueError(
@@ -53,17 +67,41 @@ class LLMLoader:
                     "Please add OPENAI_API_KEY=your_api_key to your .env file"
                 )
 
+        LLMLoader._checked_providers.add(provider)
+
+    def _get_client(self, reload: bool = False):
+        """
+        Get the chat model client for the current model and provider.
+
+        Args:
+            reload: Create a new client even if one is already cached
+
+        Returns:
+            Chat model client, shared by loaders using the same model
+        """
+        key = (self.model_name, self.model_provider)
+        if reload or key not in self._clients:
+            # langchain is slow to import, only pay for it when a client is created
+            from langchain.chat_models import init_chat_model
+
+            self._clients[key] = init_chat_model(
+                self.model_name, model_provider=self.model_provider, temperature=self.temperature
+            )
+
+        return self._clients[key]
+
     def get_model(self):
         """
         Get the initialized model instance.
 
+        The temperature is bound to each call, so the underlying client is only
+        initialized once per model and provider.
+
         Returns:
             Initialized chat model
         """
         if self._model is None:
-            self._model = init_chat_model(
-                self.model_name, model_provider=self.model_provider, temperature=self.temperature
-            )
+            self._model = self._get_client().bind(temperature=self.temperature)
 
         return self._model
 
@@ -74,9 +112,7 @@ class LLMLoader:
         Returns:
             Newly initialized chat model
         """
-        self._model = init_chat_model(
-            self.model_name, model_provider=self.model_provider, temperature=self.temperature
-        )
+        self._model = self._get_client(reload=True).bind(temperature=self.temperature)
         return self._model
 
     def change_model(
@@ -94,7 +130,7 @@ class LLMLoader:
             temperature: New temperature setting (optional, keeps current if not provided)
 
         Returns:
-            Newly initialized chat model
+            Chat model for the new settings, initialized only if not used before
         """
         self.model_name = model_name
         if model_provider:
@@ -103,23 +139,25 @@ class LLMLoader:
         if temperature is not None:
             self.temperature = temperature
 
-        return self.reload_model()
+        self._model = None
+        return self.get_model()
 
     def set_temperature(self, temperature: float):
         """
-        Set a new temperature and reload the model.
+        Set a new temperature, keeping the current model client.
 
         Args:
             temperature: New temperature value (0.0-1.0)
 
         Returns:
-            Reloaded model with new temperature
+            Model with the new temperature bound
         """
         if not 0.0 <= temperature <= 1.0:
             raise ValueError("Temperature must be between 0.0 and 1.0")
 
         self.temperature = temperature
-        return self.reload_model()
+        self._model = None
+        return self.get_model()
 
 
 def get_default_model(temperature: float = 0.7):
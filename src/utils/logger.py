@@ -2,6 +2,9 @@
 import logging
 import os
 
+# Loggers already set up, by name and log file
+_loggers = {}
+
 
 def setup_logger(name, log_file="logs/run.log", level=logging.INFO):
     """Set up the logger with the specified log level.
@@ -11,20 +14,26 @@ def setup_logger(name, log_file="logs/run.log", level=logging.INFO):
         log_file: The file to which logs should be written.
         level: The logging level to use. Default is INFO.
     """
-    formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-    os.makedirs(os.path.dirname(log_file), exist_ok=True)
-
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setFormatter(formatter)
-
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
+    key = (name, log_file)
+    if key in _loggers:
+        return _loggers[key]
 
     logger = logging.getLogger(name)
 
+    # Handlers are only built, and the log file only opened, the first time
     if not logger.handlers:
+        formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+        os.makedirs(os.path.dirname(log_file), exist_ok=True)
+
+        file_handler = logging.FileHandler(log_file)
+        file_handler.setFormatter(formatter)
+
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+
         logger.setLevel(level)
         logger.addHandler(file_handler)
         logger.addHandler(console_handler)
 
+    _loggers[key] = logger
     return logger
@@ -1,15 +1,43 @@
 """
 Utility functions for process management.
 """
+import os
+import signal
 import subprocess
 import shlex
 import logging
 
+BUILDKITD_PIDFILE = "/run/buildkit/buildkitd.pid"
+
+def _kill_buildkitd_from_pidfile() -> bool:
+    """
+    Send SIGTERM to the buildkitd process named in BUILDKITD_PIDFILE.
+    Returns False if that is not possible, the caller then falls back to pkill.
+    """
+    try:
+        with open(BUILDKITD_PIDFILE, "r") as pidfile:
+            pid = int(pidfile.read().strip())
+        # A stale pidfile may name a pid reused by another process
+        with open(f"/proc/{pid}/comm", "r") as comm:
+            if comm.read().strip() != "buildkitd":
+                return False
+        os.kill(pid, signal.SIGTERM)
+    except (OSError, ValueError):
+        # Missing or unreadable pidfile, process already gone, or owned by root
+        return False
+    return True
+
 def terminate_buildkitd() -> None:
     """
     Terminate the buildkitd process if it is running.
+
+    The process is signalled directly when its pidfile is readable and it can
+    be signalled without sudo, otherwise `sudo pkill buildkitd` is used.
     """
     logger = logging.getLogger(__name__)
+    if _kill_buildkitd_from_pidfile():
+        logger.info("[✓] buildkitd process terminated successfully.")
+        return
     try:
         logger.info("Attempting to terminate buildkitd process...")
         result = subprocess.run(
@@ -1,9 +1,19 @@
+import functools
 import os
+import threading
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 from base import Loggable
-from load_llm import LLMLoader
+
+# Directory names a catalog application path goes through
+CATALOG_NAMES = frozenset(("catalog", "catalog-core"))
+
+# Maximum number of RunConfig generation requests sent to the LLM at once
+LLM_MAX_CONCURRENCY = 8
+
+# README file names by preference, compared in lower case
+README_RANKS = {"readme.md": 0, "readme.txt": 1, "readme": 2}
 
 
 class TestAppConfig(Loggable):
@@ -11,6 +21,9 @@ class TestAppConfig(Loggable):
     A class to handle test application configuration setup from catalog directories.
     """
 
+    # Serializes the creation of the LLM model when configs are set up from several threads
+    _model_lock = threading.Lock()
+
     def __init__(self, base_test_dir: Optional[str] = None):
         """
         Initialize TestAppConfig.
@@ -24,33 +37,17 @@ class TestAppConfig(Loggable):
         else:
             self.base_test_dir = base_test_dir
 
-    def check_directory_exists(self, directory_path: Path) -> bool:
+    @functools.cached_property
+    def _model(self):
         """
-        Check if the given directory exists.
-
-        Args:
-            directory_path: Path to the directory to check
-
-        Returns:
-            bool: True if directory exists, False otherwise
+        LLM model used to generate RunConfig.yaml, created on first use and then
+        reused for every directory set up by this instance.
         """
-        catalog_type, relative_path = self._extract_catalog_info(directory_path)
-
-        if not catalog_type or not relative_path:
-            raise ValueError(
-                f"Could not identify catalog or catalog-core in path: {directory_path}"
-            )
+        # Imported here so that applications whose config already exists never load it
+        from load_llm import LLMLoader
 
-        filename = "RunConfig.yaml"
-        target_path = Path(self.base_test_dir) / catalog_type / relative_path / filename
-
-        if target_path.exists():
-            self.logger.info(
-                f"RunConfig.yaml already exists at {target_path}, skipping generation."
-            )
-            return True
-
-        return False
+        with self._model_lock:
+            return LLMLoader().get_model()
 
     def setup_config(self, source_directory: str) -> dict:
         """
@@ -60,48 +57,94 @@ class TestAppConfig(Loggable):
             source_directory: Path like /home/machine/catalog/library/helloworld/1.2
 
         Returns:
-            dict: Configuration data including paths and README content
+            dict: Configuration data including paths and README content, empty if
+            RunConfig.yaml already exists
         """
-        source_path = Path(source_directory)
-
-        # Extract catalog type and remaining path
-        catalog_type, relative_path = self._extract_catalog_info(source_path)
-
-        if not catalog_type or not relative_path:
-            raise ValueError(
-                f"Could not identify catalog or catalog-core in path: {source_directory}"
-            )
-
-        # First, try to load README data
-        readme_content = self._load_readme_data(source_path)
-
-        if readme_content is None:
-            raise FileNotFoundError(f"No README file found in source directory: {source_directory}")
+        return self.setup_configs([source_directory])[0]
 
-        # Only if README is successfully loaded, create the directory structure
-        target_path = Path(self.base_test_dir) / catalog_type / relative_path
-        self._create_directory_structure_only(target_path)
+    def setup_configs(self, source_directories: List[str]) -> List[dict]:
+        """
+        Process several catalog directory paths, generating all their RunConfig.yaml
+        files with a single batched LLM call.
 
-        # Generate RunConfig.yaml using LLM
-        run_config_content = self._generate_run_config(readme_content, relative_path)
+        Args:
+            source_directories: Paths like /home/machine/catalog/library/helloworld/1.2
 
-        # Save RunConfig.yaml to target directory
-        run_config_path = target_path / "RunConfig.yaml"
-        self._save_config(run_config_path, run_config_content)
+        Returns:
+            list: Configuration data of each directory, in the given order, empty
+            for a directory whose RunConfig.yaml already exists
+        """
+        apps = []
+        for source_directory in source_directories:
+            source_path = Path(source_directory)
+
+            # Extract catalog type and remaining path
+            catalog_type, relative_path = self._extract_catalog_info(source_path)
+
+            if not catalog_type or not relative_path:
+                raise ValueError(
+                    f"Could not identify catalog or catalog-core in path: {source_directory}"
+                )
+
+            # Nothing to do if the config was generated before, checked before reading the README
+            target_path = Path(self.base_test_dir) / catalog_type / relative_path
+            if (target_path / "RunConfig.yaml").exists():
+                self.logger.info(
+                    f"RunConfig.yaml already exists at {target_path}, skipping generation."
+                )
+                apps.append(None)
+                continue
+
+            # First, try to load README data
+            readme_content = self._load_readme_data(source_path)
+
+            if readme_content is None:
+                raise FileNotFoundError(
+                    f"No README file found in source directory: {source_directory}"
+                )
+
+            # Only if README is successfully loaded, create the directory structure
+            self._create_directory_structure_only(target_path)
+
+            apps.append((source_path, catalog_type, relative_path, target_path, readme_content))
+
+        # Generate all RunConfig.yaml files using LLM
+        new_apps = [app for app in apps if app is not None]
+        run_config_contents = iter(
+            self._generate_run_configs(
+                [(readme, relative_path) for _, _, relative_path, _, readme in new_apps]
+            )
+        )
+
+        results = []
+        for app in apps:
+            if app is None:
+                results.append({})
+                continue
+
+            run_config_content = next(run_config_contents)
+            source_path, catalog_type, relative_path, target_path, readme_content = app
+
+            # Save RunConfig.yaml and BuildConfig.yaml to target directory
+            run_config_path = target_path / "RunConfig.yaml"
+            self._save_configs(
+                target_path,
+                [("RunConfig.yaml", run_config_content), ("BuildConfig.yaml", "th_time: 300")],
+            )
 
-        # creating BuildConfig.yaml
-        build_config_path = target_path / "BuildConfig.yaml"
-        self._save_config(build_config_path, "th_time: 300")
+            results.append(
+                {
+                    "source_directory": str(source_path),
+                    "catalog_type": catalog_type,
+                    "relative_path": str(relative_path),
+                    "target_directory": str(target_path),
+                    "readme_content": readme_content,
+                    "run_config_content": run_config_content,
+                    "run_config_path": str(run_config_path),
+                }
+            )
 
-        return {
-            "source_directory": str(source_path),
-            "catalog_type": catalog_type,
-            "relative_path": str(relative_path),
-            "target_directory": str(target_path),
-            "readme_content": readme_content,
-            "run_config_content": run_config_content,
-            "run_config_path": str(run_config_path),
-        }
+        return results
 
     def _extract_catalog_info(self, source_path: Path) -> Tuple[Optional[str], Optional[Path]]:
         """
@@ -112,13 +155,13 @@ class TestAppConfig(Loggable):
         """
         parts = source_path.parts
 
-        for i, part in enumerate(parts):
-            if part == "catalog-core":
-                return "catalog-core", Path(*parts[i + 1 :])
-            elif part == "catalog":
-                return "catalog", Path(*parts[i + 1 :])
+        # The search is done by the set and tuple methods, the first catalog in the path wins
+        found = CATALOG_NAMES.intersection(parts)
+        if not found:
+            return None, None
 
-        return None, None
+        i = min(parts.index(name) for name in found)
+        return parts[i], Path(*parts[i + 1 :])
 
     def _create_directory_structure_only(self, target_path: Path) -> None:
         """
@@ -134,55 +177,79 @@ class TestAppConfig(Loggable):
         Returns:
             README content as string, or None if not found
         """
-        readme_files = ["README.md", "README.txt", "README", "readme.md", "readme.txt", "readme"]
-
-        for readme_name in readme_files:
-            readme_path = source_path / readme_name
-            if readme_path.exists() and readme_path.is_file():
+        # One directory listing instead of a stat per possible name. README.md is preferred,
+        # then README.txt and README, an upper case name before a lower case one
+        candidates = []
+        try:
+            with os.scandir(source_path) as entries:
+                for entry in entries:
+                    rank = README_RANKS.get(entry.name.lower())
+                    if rank is not None and entry.is_file():
+                        candidates.append(((rank, entry.name.islower()), Path(entry.path)))
+        except OSError:
+            return None
+        candidates.sort()
+
+        for _, readme_path in candidates:
+            try:
+                with open(readme_path, "r", encoding="utf-8") as f:
+                    return f.read()
+            except UnicodeDecodeError:
+                # Try with different encoding if UTF-8 fails
                 try:
-                    with open(readme_path, "r", encoding="utf-8") as f:
+                    with open(readme_path, "r", encoding="latin-1") as f:
                         return f.read()
-                except UnicodeDecodeError:
-                    # Try with different encoding if UTF-8 fails
-                    try:
-                        with open(readme_path, "r", encoding="latin-1") as f:
-                            return f.read()
-                    except Exception as e:
-                        self.logger.warning(f"Warning: Could not read {readme_path}: {e}")
-                        continue
                 except Exception as e:
                     self.logger.warning(f"Warning: Could not read {readme_path}: {e}")
                     continue
+            except Exception as e:
+                self.logger.warning(f"Warning: Could not read {readme_path}: {e}")
+                continue
 
         return None
 
-    def _generate_run_config(self, readme_content: str, relative_path: Path) -> str:
+    def _generate_run_configs(self, apps: List[Tuple[str, Path]]) -> List[str]:
         """
-        Generate RunConfig.yaml content using LLM based on README content.
+        Generate RunConfig.yaml contents using LLM based on README contents.
+
+        The prompts of all applications are sent in one batch, so the requests
+        are made concurrently instead of one after the other.
 
         Args:
-            readme_content: Content from README file
-            relative_path: Relative path of the application
+            apps: README content and relative path of each application
 
         Returns:
-            Generated RunConfig.yaml content as string
+            Generated RunConfig.yaml content of each application, in the given order
         """
-        try:
-            # Initialize LLM
-            llm_loader = LLMLoader()
-            model = llm_loader.get_model()
-
-            # Create prompt for RunConfig generation
-            prompt = self._create_run_config_prompt(readme_content, relative_path)
+        # The model is not even created when every config already exists
+        if not apps:
+            return []
 
-            # Generate RunConfig using LLM
-            response = model.invoke(prompt)
-
-            return str(response.content)
+        failed = "LLM generation failed. Please check the README content and try again."
+        try:
+            # Create prompts for RunConfig generation
+            prompts = [
+                self._create_run_config_prompt(readme_content, relative_path)
+                for readme_content, relative_path in apps
+            ]
+
+            # Generate RunConfigs using LLM, a failed request does not fail the others
+            responses = self._model.batch(
+                prompts, config={"max_concurrency": LLM_MAX_CONCURRENCY}, return_exceptions=True
+            )
 
         except Exception as e:
             self.logger.warning(f"Warning: Could not generate RunConfig using LLM: {e}")
-            return "LLM generation failed. Please check the README content and try again."
+            return [failed] * len(apps)
+
+        run_configs = []
+        for response in responses:
+            if isinstance(response, Exception):
+                self.logger.warning(f"Warning: Could not generate RunConfig using LLM: {response}")
+                run_configs.append(failed)
+            else:
+                run_configs.append(str(response.content))
+        return run_configs
 
     def _create_run_config_prompt(self, readme_content: str, relative_path: Path) -> str:
         """
@@ -298,12 +365,29 @@ Do **not** include any commentary—only output the raw YAML.
             content: Configuration content to save
         """
         try:
-            with open(config_path, "w", encoding="utf-8") as f:
-                f.write(content)
+            # The files are small, written with plain os.write calls without a buffered file object
+            data = memoryview(content.encode("utf-8"))
+            fd = os.open(config_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                while data:
+                    data = data[os.write(fd, data) :]
+            finally:
+                os.close(fd)
             self.logger.info(f"Configuration file saved at: {config_path}")
         except Exception as e:
             self.logger.warning(f"Warning: Could not save configuration file {config_path}: {e}")
 
+    def _save_configs(self, target_path: Path, files: List[Tuple[str, str]]) -> None:
+        """
+        Save several configuration files to the same directory.
+
+        Args:
+            target_path: Directory where to save the configuration files
+            files: Name and content of each configuration file
+        """
+        for filename, content in files:
+            self._save_config(target_path / filename, content)
+
 
 def main(directory_path: str) -> dict:
     """
@@ -311,8 +395,7 @@ def main(directory_path: str) -> dict:
     """
     try:
         test_config = TestAppConfig()
-        if test_config.check_directory_exists(Path(directory_path)):
-            return {}
+        # Returns an empty dict if the config already exists
         test_app_config = test_config.setup_config(directory_path)
         return test_app_config
     except Exception as e:
@@ -1,6 +1,46 @@
+import functools
 import logging
 import os
-from datetime import datetime
+import threading
+import time
+
+_LOGGER = logging.getLogger("test_framework")
+
+# Directory names of the catalog repositories, an app path is kept from there on
+CATALOG_NAMES = frozenset(("catalog", "catalog-core"))
+
+# Permissions of the directories created for sessions, before the umask is applied
+SESSION_DIR_MODE = 0o755
+
+# Session parent directories known to exist, created at most once per process
+_CREATED_PREFIXES = set()
+_CREATED_PREFIXES_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _cwd() -> str:
+    """Return the working directory, the framework never changes it while running."""
+    return os.getcwd()
+
+
+@functools.lru_cache(maxsize=256)
+def _app_structure(app_dir: str) -> str:
+    """Return the part of app_dir used as its directory under .sessions."""
+    # Remove path before the catalog directory from app_directory. Only a whole path component
+    # counts, and the first one wins, so /home/catalog-dev/catalog/library/app gives
+    # catalog/library/app rather than everything after the first "/catalog" substring
+    parts = app_dir.split("/")
+    for i, part in enumerate(parts):
+        if part in CATALOG_NAMES:
+            return "/".join(parts[i:])
+    # If /catalog not found, use the entire app_dir structure
+    return os.path.basename(app_dir)
+
+
+@functools.lru_cache(maxsize=256)
+def _sessions_parent(app_dir: str) -> str:
+    """Return the directory the sessions of app_dir go to, ending with a separator."""
+    return os.path.join(_cwd(), ".sessions", _app_structure(app_dir), "")
 
 
 class SessionSetup:
@@ -8,6 +48,11 @@ class SessionSetup:
     Class to handle session setup including session name generation and directory creation.
     """
 
+    __slots__ = ("app_dir", "logger", "session_name", "_session_dir")
+
+    # Last formatted timestamp and the minute since the epoch it was formatted for
+    _ts_cache = (None, None)
+
     def __init__(self, app_dir, custom_session_name=None):
         """
         Initialize SessionSetup with application directory path.
@@ -16,9 +61,24 @@ class SessionSetup:
             app_dir (str): Path to the application directory being tested
         """
         self.app_dir = app_dir
-        self.logger = logging.getLogger("test_framework")
+        self.logger = _LOGGER
         self._generate_session_name(custom_session_name)
-        self.session_dir = self._setup_directory()
+        self._session_dir = None
+
+    @property
+    def session_dir(self):
+        """
+        Session directory, created on first access so that a session which never
+        writes anything does not create it.
+        """
+        if self._session_dir is None:
+            self._session_dir = self._setup_directory()
+        return self._session_dir
+
+    @property
+    def session_reports_dir(self):
+        """Reports directory of the session, created along with the session directory."""
+        return os.path.join(self.session_dir, "reports")
 
     def _generate_session_name(self, custom_session_name=None):
         """
@@ -34,13 +94,18 @@ class SessionSetup:
         # Use custom name or default to 'session'
         base_name = custom_session_name if custom_session_name else "session"
 
-        # Get current date and time
-        now = datetime.now()
-        timestamp = now.strftime("%d_%m_%Y_%H_%M")
+        # Get current date and time, formatted once per minute
+        minute = int(time.time()) // 60
+        cached_minute, timestamp = SessionSetup._ts_cache
+        if minute != cached_minute:
+            # The fields are plain integers, formatting them directly skips strftime
+            t = time.localtime(minute * 60)
+            timestamp = f"{t.tm_mday:02d}_{t.tm_mon:02d}_{t.tm_year}_{t.tm_hour:02d}_{t.tm_min:02d}"
+            SessionSetup._ts_cache = (minute, timestamp)
 
         # Combine base name with timestamp
         self.session_name = f"{base_name}_{timestamp}"
-        self.logger.info(f"Generated session name: {self.session_name}")
+        self.logger.info("Generated session name: %s", self.session_name)
 
     def _setup_directory(self):
         """
@@ -50,36 +115,36 @@ class SessionSetup:
             str: Path to the created session directory
 
         Raises:
-            ValueError: If session name hasn't been generated yet
             OSError: If directory creation fails
         """
-        if not self.session_name:
-            raise ValueError("Session name must be generated before setting up directory")
-
-        # Remove path before /catalog from app_directory
-        catalog_index = self.app_dir.find("/catalog")
-        if catalog_index != -1:
-            tmp_app_directory_structure = self.app_dir[catalog_index + 1 :]  # Remove leading '/'
-        else:
-            # If /catalog not found, use the entire app_dir structure
-            tmp_app_directory_structure = os.path.basename(self.app_dir)
-
-        # Get current working directory
-        cwd = os.getcwd()
-
-        # Create session directory path: cwd/sessions/{tmp_app_directory_structure}/{session_name}
-        self.session_dir = os.path.join(
-            cwd, ".sessions", tmp_app_directory_structure, self.session_name
-        )
-        self.session_reports_dir = os.path.join(self.session_dir, "reports")
+        # Create session directory path: cwd/.sessions/{app_directory_structure}/{session_name},
+        # only the session name is joined here, the rest is the same for every session of an app
+        prefix = _sessions_parent(self.app_dir)
+        session_dir = prefix + self.session_name
+        session_reports_dir = os.path.join(session_dir, "reports")
 
         try:
-            # Create the directory with parents=True to create all intermediate directories
-            os.makedirs(self.session_reports_dir , exist_ok=True)
-            self.logger.info(f"Session directory created: {self.session_dir}")
-
-            return self.session_dir
+            # The parents are only created for the first session of an app, after that the
+            # session directory is a single mkdir
+            with _CREATED_PREFIXES_LOCK:
+                if prefix not in _CREATED_PREFIXES:
+                    os.makedirs(prefix, mode=SESSION_DIR_MODE, exist_ok=True)
+                    _CREATED_PREFIXES.add(prefix)
+            try:
+                os.mkdir(session_dir, SESSION_DIR_MODE)
+            except FileExistsError:
+                pass
+            except FileNotFoundError:
+                # The parents were removed while running
+                os.makedirs(session_dir, mode=SESSION_DIR_MODE, exist_ok=True)
+            try:
+                os.mkdir(session_reports_dir, SESSION_DIR_MODE)
+            except FileExistsError:
+                pass
+            self.logger.info("Session directory created: %s", session_dir)
+
+            return session_dir
 
         except OSError as e:
-            self.logger.error(f"Failed to create session directory {self.session_dir}: {e}")
+            self.logger.error("Failed to create session directory %s: %s", session_dir, e)
             raise
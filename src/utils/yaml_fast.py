@@ -0,0 +1,57 @@
+"""
+This module provides YAML helpers backed by LibYAML when it is available.
+"""
+
+import logging
+
+import yaml
+
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+
+    _LIBYAML = True
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
+    _LIBYAML = False
+
+_warned = False
+
+
+def _warn_without_libyaml() -> None:
+    """Warn, once per process, that YAML goes through the pure-Python implementation."""
+    global _warned
+    if not _LIBYAML and not _warned:
+        _warned = True
+        logging.getLogger("test_framework").warning(
+            "PyYAML is built without LibYAML, falling back to the slower pure-Python parser"
+        )
+
+
+def safe_load(stream):
+    """Parse a YAML stream with the C safe loader, falling back to the pure-Python one.
+
+    Args:
+        stream: An open file object or a string holding YAML content.
+
+    Returns:
+        The parsed YAML document.
+    """
+    _warn_without_libyaml()
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def safe_dump(data, stream=None, **kwargs):
+    """Serialize data with the C safe dumper, falling back to the pure-Python one.
+
+    Args:
+        data: The document to serialize.
+        stream: An open file object, or None to return the YAML as a string.
+        **kwargs: Formatting options passed to yaml.dump, e.g. sort_keys.
+
+    Returns:
+        The YAML string if no stream is given, None otherwise.
+    """
+    _warn_without_libyaml()
+    return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)